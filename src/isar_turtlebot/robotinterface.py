@@ -1,12 +1,23 @@
+import asyncio
 import logging
 import time
-from datetime import datetime
-from io import BytesIO
+from asyncio import AbstractEventLoop
+from datetime import datetime, timezone
+from functools import partial
 from logging import Logger
-from typing import Any, Optional, Sequence, Tuple
+from operator import itemgetter
+from threading import Thread
+from typing import (
+    Any,
+    Callable,
+    Coroutine,
+    Dict,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
 
-import numpy as np
-import PIL.Image as PILImage
 from robot_interface.models.geometry.frame import Frame
 from robot_interface.models.geometry.joints import Joints
 from robot_interface.models.geometry.orientation import Orientation
@@ -36,6 +47,32 @@ from isar_turtlebot.config import config
 from isar_turtlebot.models.turtlebot_status import TurtlebotStatus
 from isar_turtlebot.ros_bridge.ros_bridge import RosBridge
 from isar_turtlebot.utilities.inspection_pose import get_inspection_pose
+from isar_turtlebot.utilities.thermal_image import get_thermal_image
+
+T = TypeVar("T")
+
+_IMAGE_FILETYPE: str = config.get("metadata", "image_filetype")
+_THERMAL_IMAGE_FILETYPE: str = config.get("metadata", "thermal_image_filetype")
+
+_INSPECTION_REFERENCES: Dict[type, Tuple[type, str]] = {
+    TakeImage: (ImageReference, _IMAGE_FILETYPE),
+    TakeThermalImage: (ThermalImageReference, _THERMAL_IMAGE_FILETYPE),
+}
+
+_get_position: itemgetter = itemgetter("x", "y", "z")
+_get_orientation: itemgetter = itemgetter("x", "y", "z", "w")
+
+_robot_position: Callable[..., Position] = partial(Position, frame=Frame.Robot)
+_robot_orientation: Callable[..., Orientation] = partial(Orientation, frame=Frame.Robot)
+_robot_pose: Callable[..., Pose] = partial(Pose, frame=Frame.Robot)
+
+# The goal header never changes between navigation tasks, so it is shared by
+# all published messages and only the pose is built per call.
+_NAVIGATION_HEADER: dict = {
+    "seq": 0,
+    "stamp": {"secs": 1533, "nsecs": 746000000},
+    "frame_id": "map",
+}
 
 
 class Robot(RobotInterface):
@@ -49,6 +86,13 @@ class Robot(RobotInterface):
         )
         self.current_task: Optional[str] = None
         self.inspection_status: Optional[TurtlebotStatus] = None
+        self._pose_cache: Optional[Tuple[dict, Pose]] = None
+
+        self._loop: AbstractEventLoop = asyncio.new_event_loop()
+        self._loop_thread: Thread = Thread(
+            target=self._loop.run_forever, name="robot_event_loop", daemon=True
+        )
+        self._loop_thread.start()
 
     def schedule_task(self, task: Task) -> Tuple[bool, Optional[Any], Optional[Joints]]:
         run_id: str = self._publish_task(task=task)
@@ -76,94 +120,86 @@ class Robot(RobotInterface):
     def get_inspection_references(
         self, vendor_mission_id: Any, current_task: Task
     ) -> Sequence[Inspection]:
-        now: datetime = datetime.utcnow()
-
-        if isinstance(current_task, TakeImage):
-            self.bridge.visual_inspection.register_run_id(run_id=vendor_mission_id)
-            pose: Pose = self._get_robot_pose()
-            image_metadata: ImageMetadata = ImageMetadata(
-                start_time=now,
-                time_indexed_pose=TimeIndexedPose(pose=pose, time=now),
-                file_type=config.get("metadata", "image_filetype"),
-            )
-            image_ref: ImageReference = ImageReference(
-                id=vendor_mission_id, metadata=image_metadata
-            )
-        elif isinstance(current_task, TakeThermalImage):
-            self.bridge.visual_inspection.register_run_id(run_id=vendor_mission_id)
-            pose: Pose = self._get_robot_pose()
-            image_metadata: ImageMetadata = ImageMetadata(
-                start_time=now,
-                time_indexed_pose=TimeIndexedPose(pose=pose, time=now),
-                file_type=config.get("metadata", "thermal_image_filetype"),
-            )
-            image_ref: ThermalImageReference = ThermalImageReference(
-                id=vendor_mission_id, metadata=image_metadata
-            )
+        now: datetime = datetime.now(tz=timezone.utc)
+
+        reference_type, file_type = _INSPECTION_REFERENCES[type(current_task)]
+        self.bridge.visual_inspection.register_run_id(run_id=vendor_mission_id)
+        pose: Pose = self._get_robot_pose()
+        image_metadata: ImageMetadata = ImageMetadata(
+            start_time=now,
+            time_indexed_pose=TimeIndexedPose(pose=pose, time=now),
+            file_type=file_type,
+        )
+        image_ref: ImageReference = reference_type(
+            id=vendor_mission_id, metadata=image_metadata
+        )
 
         return [image_ref]
 
     def download_inspection_result(
         self, inspection: Inspection
     ) -> Optional[InspectionResult]:
-        if isinstance(inspection, ImageReference):
-            try:
-                image_data = self.bridge.visual_inspection.read_image(
-                    run_id=inspection.id
-                )
-
-                inspection_result = Image(
-                    id=inspection.id, metadata=inspection.metadata, data=image_data
-                )
-            except (KeyError, TypeError, FileNotFoundError) as e:
-                self.logger("Failed to retreive inspection result", e)
-                inspection_result = None
-        elif isinstance(inspection, ThermalImageReference):
-            try:
-                image_data = self.bridge.visual_inspection.read_image(
-                    run_id=inspection.id
-                )
-                image = PILImage.open(BytesIO(image_data))
-                image_array = np.asarray(image)
-                image_red = image_array[:, :, 0]
-                image_grey = PILImage.fromarray(image_red)
-                image_array_io = BytesIO()
-                image_grey.save(image_array_io, format=inspection.metadata.file_type)
-                inspection_result = ThermalImage(
-                    id=inspection.id,
-                    metadata=inspection.metadata,
-                    data=image_array_io.getvalue(),
-                )
-            except Exception as e:
-                self.logger("Failed to retreive inspection result", e)
-                inspection_result = None
-        return inspection_result
+        to_result: Optional[
+            Callable[[Robot, Inspection, bytes], Optional[InspectionResult]]
+        ] = self._RESULT_DISPATCH.get(type(inspection))
+        if to_result is None:
+            raise NotImplementedError(
+                f"Inspection result: {inspection} is not implemented on {self}"
+            )
+
+        image_data: Optional[bytes] = self._fetch_image(run_id=inspection.id)
+        if image_data is None:
+            return None
+
+        return to_result(self, inspection=inspection, image_data=image_data)
+
+    def _image_result(
+        self, inspection: ImageReference, image_data: bytes
+    ) -> Optional[InspectionResult]:
+        return Image(id=inspection.id, metadata=inspection.metadata, data=image_data)
+
+    def _thermal_image_result(
+        self, inspection: ThermalImageReference, image_data: bytes
+    ) -> Optional[InspectionResult]:
+        try:
+            thermal_image_data: bytes = get_thermal_image(
+                image_data=image_data, file_type=inspection.metadata.file_type
+            )
+        except Exception:
+            self.logger.exception("Failed to convert thermal inspection result")
+            return None
+        return ThermalImage(
+            id=inspection.id,
+            metadata=inspection.metadata,
+            data=thermal_image_data,
+        )
+
+    def _fetch_image(self, run_id: str) -> Optional[bytes]:
+        try:
+            return self.bridge.visual_inspection.read_image(run_id=run_id)
+        except KeyError:
+            self.logger.exception("Failed to retrieve inspection result")
+            return None
 
     def robot_pose(self) -> Pose:
         return self._get_robot_pose()
 
     def _get_robot_pose(self) -> Pose:
-
-        pose_message: dict = self.bridge.pose.get_value()
-        position_message: dict = pose_message["pose"]["pose"]["position"]
-        orientation_message: dict = pose_message["pose"]["pose"]["orientation"]
-
-        pose: Pose = Pose(
-            position=Position(
-                x=position_message["x"],
-                y=position_message["y"],
-                z=position_message["z"],
-                frame=Frame.Robot,
-            ),
-            orientation=Orientation(
-                x=orientation_message["x"],
-                y=orientation_message["y"],
-                z=orientation_message["z"],
-                w=orientation_message["w"],
-                frame=Frame.Robot,
-            ),
-            frame=Frame.Robot,
+        message: dict = self.bridge.pose.get_value()
+        # The topic replaces its value on every message, so the cached pose is
+        # valid for as long as the same message object is current.
+        if self._pose_cache is not None and self._pose_cache[0] is message:
+            return self._pose_cache[1]
+
+        pose_message: dict = message["pose"]["pose"]
+        x, y, z = _get_position(pose_message["position"])
+        qx, qy, qz, qw = _get_orientation(pose_message["orientation"])
+
+        pose: Pose = _robot_pose(
+            position=_robot_position(x=x, y=y, z=z),
+            orientation=_robot_orientation(x=qx, y=qy, z=qz, w=qw),
         )
+        self._pose_cache = (message, pose)
         return pose
 
     def _task_status(self) -> TurtlebotStatus:
@@ -172,56 +208,79 @@ class Robot(RobotInterface):
         return self._navigation_status()
 
     def _navigation_status(self) -> TurtlebotStatus:
-        message: dict = self.bridge.mission_status.get_value()
+        mission_status: Optional[Tuple[str, int]] = (
+            self.bridge.mission_status.get_parsed()
+        )
+        if mission_status is None:
+            return TurtlebotStatus.Unexpected
+        _, status_code = mission_status
         turtle_status: TurtlebotStatus = TurtlebotStatus.map_to_turtlebot_status(
-            message["status_list"][0]["status"]
+            status_code
         )
         return turtle_status
 
     def _publish_task(self, task: Task) -> str:
-        if isinstance(task, DriveToPose):
-            self.current_task = "navigation"
-            previous_run_id: str = self._get_run_id()
-            self._publish_navigation_task(pose=task.pose)
-            run_id: str = self._wait_for_updated_task(previous_run_id=previous_run_id)
-
-            return run_id
-        elif isinstance(task, (TakeImage, TakeThermalImage)):
-            self.current_task = "inspection"
-            run_id: str = self._publish_inspection_task(target=task.target)
-            try:
-                self._do_inspection_task()
-            except TimeoutError as e:
-                self.logger.error(e)
-                self.current_task = None
-
-            return run_id
-
-        else:
+        publish: Optional[Callable[[Robot, Task], str]] = self._PUBLISH_DISPATCH.get(
+            type(task)
+        )
+        if publish is None:
             raise NotImplementedError(
                 f"Scheduled task: {task} is not implemented on {self}"
             )
+        return publish(self, task)
 
-    def _do_inspection_task(self):
-        start_time: float = time.time()
-        while self._navigation_status() is not TurtlebotStatus.Succeeded:
-            time.sleep(0.1)
-            execution_time: float = time.time() - start_time
-            if execution_time > self.inspection_task_timeout:
-                self.inspection_status = TurtlebotStatus.Failure
-                raise TimeoutError(
-                    f"Drive to inspection pose task for TurtleBot3 timed out. Run ID: {self._get_run_id()}"
-                )
+    def _publish_drive_task(self, task: DriveToPose) -> str:
+        self.current_task = "navigation"
+        previous_run_id: str = self._get_run_id()
+        self._publish_navigation_task(pose=task.pose)
+        run_id: str = self._run(
+            self._wait_for_updated_task(previous_run_id=previous_run_id)
+        )
+
+        return run_id
+
+    def _publish_take_image_task(self, task: TakeImage) -> str:
+        self.current_task = "inspection"
+        run_id: str = self._publish_inspection_task(target=task.target)
+        try:
+            self._run(self._do_inspection_task())
+        except TimeoutError as e:
+            self.logger.error(e)
+            self.current_task = None
+
+        return run_id
+
+    def _run(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    async def _do_inspection_task(self) -> None:
+        start_time: float = time.monotonic()
+        try:
+            await asyncio.wait_for(
+                self.bridge.mission_status.wait_for(
+                    lambda: self._navigation_status() is TurtlebotStatus.Succeeded
+                ),
+                timeout=self.inspection_task_timeout,
+            )
+        except asyncio.TimeoutError:
+            self.inspection_status = TurtlebotStatus.Failure
+            raise TimeoutError(
+                f"Drive to inspection pose task for TurtleBot3 timed out. Run ID: {self._get_run_id()}"
+            )
 
         self.bridge.visual_inspection.take_image()
-        while not self.bridge.visual_inspection.stored_image():
-            time.sleep(0.1)
-            execution_time: float = time.time() - start_time
-            if execution_time > self.inspection_task_timeout:
-                self.inspection_status = TurtlebotStatus.Failure
-                raise TimeoutError(
-                    f"Storing image for TurtleBot3 timed out. Run ID: {self._get_run_id()}"
-                )
+        execution_time: float = time.monotonic() - start_time
+        try:
+            await asyncio.wait_for(
+                self.bridge.visual_inspection.wait_for_stored_image(),
+                timeout=max(self.inspection_task_timeout - execution_time, 0),
+            )
+        except asyncio.TimeoutError:
+            self.bridge.visual_inspection.cancel_image()
+            self.inspection_status = TurtlebotStatus.Failure
+            raise TimeoutError(
+                f"Storing image for TurtleBot3 timed out. Run ID: {self._get_run_id()}"
+            )
         self.inspection_status = TurtlebotStatus.Succeeded
         self.current_task = None
 
@@ -232,18 +291,16 @@ class Robot(RobotInterface):
             current_pose=self.robot_pose(), target=target
         )
         self._publish_navigation_task(pose=inspection_pose)
-        run_id: str = self._wait_for_updated_task(previous_run_id=previous_run_id)
+        run_id: str = self._run(
+            self._wait_for_updated_task(previous_run_id=previous_run_id)
+        )
         return run_id
 
     def _publish_navigation_task(self, pose: Pose) -> None:
         pose_message: dict = {
             "goal": {
                 "target_pose": {
-                    "header": {
-                        "seq": 0,
-                        "stamp": {"secs": 1533, "nsecs": 746000000},
-                        "frame_id": "map",
-                    },
+                    "header": _NAVIGATION_HEADER,
                     "pose": {
                         "position": {
                             "x": pose.position.x,
@@ -264,25 +321,41 @@ class Robot(RobotInterface):
         self.bridge.execute_task.publish(message=pose_message)
 
     def _get_run_id(self) -> Optional[str]:
-        status_msg: dict = self.bridge.mission_status.get_value()
-        try:
-            run_id: str = status_msg["status_list"][0]["goal_id"]["id"]
-            return run_id.replace("move_base-", "").split(".")[0].replace("-", "")
-        except (KeyError, IndexError):
+        mission_status: Optional[Tuple[str, int]] = (
+            self.bridge.mission_status.get_parsed()
+        )
+        if mission_status is None:
             self.logger.info("Failed to get current mission_id returning None")
             return None
+        run_id, _ = mission_status
+        return run_id
+
+    async def _wait_for_updated_task(
+        self, previous_run_id: str, timeout: int = 20
+    ) -> str:
+        try:
+            await asyncio.wait_for(
+                self.bridge.mission_status.wait_for(
+                    lambda: self._get_run_id() != previous_run_id
+                ),
+                timeout=timeout,
+            )
+        except asyncio.TimeoutError:
+            raise TimeoutError(
+                f"Scheduling of task for TurtleBot3 timed out. Run ID: {self._get_run_id()}"
+            )
 
-    def _wait_for_updated_task(self, previous_run_id: str, timeout: int = 20) -> str:
-        start_time: float = time.time()
-        current_run_id: str = self._get_run_id()
+        return self._get_run_id()
 
-        while current_run_id == previous_run_id:
-            time.sleep(0.1)
-            execution_time: float = time.time() - start_time
-            if execution_time > timeout:
-                raise TimeoutError(
-                    f"Scheduling of task for TurtleBot3 timed out. Run ID: {current_run_id}"
-                )
-            current_run_id = self._get_run_id()
+    _PUBLISH_DISPATCH: Dict[type, Callable[["Robot", Task], str]] = {
+        DriveToPose: _publish_drive_task,
+        TakeImage: _publish_take_image_task,
+        TakeThermalImage: _publish_take_image_task,
+    }
 
-        return current_run_id
+    _RESULT_DISPATCH: Dict[
+        type, Callable[["Robot", Inspection, bytes], Optional[InspectionResult]]
+    ] = {
+        ImageReference: _image_result,
+        ThermalImageReference: _thermal_image_result,
+    }
@@ -1,11 +1,29 @@
 import logging
+import re
 from abc import ABC
 from logging import Logger
+from typing import Optional, Tuple
 
 from isar_turtlebot.config import config
 from isar_turtlebot.ros_bridge.topic import ImageTopic, Topic
 from roslibpy import Ros
 
+# Strips the "move_base-" prefix, everything from the first "." and all
+# remaining dashes from a goal id in a single pass.
+_RUN_ID_CLEANUP: re.Pattern = re.compile(r"move_base-|\..*|-")
+
+
+def parse_mission_status(message: dict) -> Optional[Tuple[str, int]]:
+    try:
+        status: dict = message["status_list"][0]
+        run_id: str = status["goal_id"]["id"]
+        return (
+            _RUN_ID_CLEANUP.sub("", run_id),
+            status["status"],
+        )
+    except (KeyError, IndexError):
+        return None
+
 
 class RosBridgeInterface(ABC):
     pass
@@ -32,6 +50,7 @@ class RosBridge(RosBridgeInterface):
             client=self.client,
             name="/move_base/status",
             message_type="actionlib_msgs/GoalStatusArray",
+            parser=parse_mission_status,
         )
 
         self.pose: Topic = Topic(
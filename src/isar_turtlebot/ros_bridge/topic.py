@@ -1,9 +1,13 @@
-import base64
+import asyncio
 import logging
+import os
 from abc import ABC, abstractmethod
+from asyncio import AbstractEventLoop
+from binascii import a2b_base64
 from logging import Logger
 from pathlib import Path
-from typing import Any, Optional
+from threading import Condition, Lock, Thread
+from typing import Any, Callable, Optional, Set, Tuple
 from uuid import uuid4
 
 from isar_turtlebot.config import config
@@ -20,6 +24,14 @@ class TopicInterface(ABC):
     def get_value(self) -> Optional[Any]:
         pass
 
+    @abstractmethod
+    def get_parsed(self) -> Optional[Any]:
+        pass
+
+    @abstractmethod
+    async def wait_for(self, predicate: Callable[[], bool]) -> None:
+        pass
+
 
 class ImageTopicInterface(ABC):
     @abstractmethod
@@ -34,6 +46,45 @@ class ImageTopicInterface(ABC):
     def read_image(self, vendor_mission_id: int) -> bytes:
         pass
 
+    @abstractmethod
+    def cancel_image(self) -> None:
+        pass
+
+    @abstractmethod
+    async def wait_for_stored_image(self) -> None:
+        pass
+
+
+class Waiters:
+    """Wakes up coroutines awaiting a topic from the rosbridge callback thread."""
+
+    def __init__(self) -> None:
+        self._lock: Lock = Lock()
+        self._waiters: Set[Tuple[AbstractEventLoop, asyncio.Event]] = set()
+
+    def notify(self) -> None:
+        with self._lock:
+            for loop, event in self._waiters:
+                loop.call_soon_threadsafe(event.set)
+
+    async def wait_for(self, predicate: Callable[[], bool]) -> None:
+        event: asyncio.Event = asyncio.Event()
+        waiter: Tuple[AbstractEventLoop, asyncio.Event] = (
+            asyncio.get_running_loop(),
+            event,
+        )
+        # Register before the first check so a message arriving in between
+        # is not lost.
+        with self._lock:
+            self._waiters.add(waiter)
+        try:
+            while not predicate():
+                await event.wait()
+                event.clear()
+        finally:
+            with self._lock:
+                self._waiters.discard(waiter)
+
 
 class Topic(TopicInterface):
     def __init__(
@@ -45,6 +96,7 @@ class Topic(TopicInterface):
         queue_size: int = 100,
         queue_length: int = 0,
         log_callbacks: bool = False,
+        parser: Optional[Callable[[dict], Any]] = None,
     ) -> None:
         self.name: str = name
         self.topic: RosTopic = RosTopic(
@@ -61,6 +113,9 @@ class Topic(TopicInterface):
             self.logger: Logger = logging.getLogger("turtlebot_bridge")
 
         self.value: Optional[Any] = None
+        self.parser: Optional[Callable[[dict], Any]] = parser
+        self.parsed: Optional[Any] = None
+        self.waiters: Waiters = Waiters()
 
         self.subscribe()
 
@@ -70,8 +125,17 @@ class Topic(TopicInterface):
     def get_value(self) -> Optional[Any]:
         return self.value
 
+    def get_parsed(self) -> Optional[Any]:
+        return self.parsed
+
+    async def wait_for(self, predicate: Callable[[], bool]) -> None:
+        await self.waiters.wait_for(predicate)
+
     def on_message(self, message: dict) -> None:
+        if self.parser is not None:
+            self.parsed = self.parser(message)
         self.value = message
+        self.waiters.notify()
         if self.log_callbacks:
             self.logger.debug(f"Updated value for topic {self.name}")
 
@@ -87,8 +151,9 @@ class ImageTopic(ImageTopicInterface):
         message_type: str,
         throttle_rate: int = 1000,
         storage_folder: Path = Path(config.get("storage", "storage_folder")),
+        store_on_disk: bool = config.getboolean("storage", "store_images_on_disk"),
         queue_size: int = 100,
-        queue_length: int = 0,
+        queue_length: int = 1,
         log_callbacks: bool = False,
     ) -> None:
         self.name: str = name
@@ -102,14 +167,28 @@ class ImageTopic(ImageTopicInterface):
         )
 
         self.log_callbacks: bool = log_callbacks
-        if self.log_callbacks:
-            self.logger: Logger = logging.getLogger("turtlebot_bridge")
+        self.logger: Logger = logging.getLogger("turtlebot_bridge")
+
+        # Single slot holding the newest unprocessed frame. Older frames are
+        # overwritten so the writer always works on the freshest image.
+        self._latest: Optional[dict] = None
+        self._frame_available: Condition = Condition()
+        self._writer: Thread = Thread(
+            target=self._store_images, name=f"{name}_writer", daemon=True
+        )
+        self._writer.start()
 
         self.storage_folder: Path = storage_folder
-        self.filenames: dict = dict()
+        self.store_on_disk: bool = store_on_disk
+        self.images: dict = dict()
+        self.current_image: Optional[bytes] = None
         self.current_filename: Optional[Path] = None
+        self.current_file: Optional[int] = None
+        self.image_stored: bool = False
+        self._capture_id: int = 0
 
         self.should_capture_image: bool = False
+        self.waiters: Waiters = Waiters()
 
         self.subscribe()
 
@@ -117,37 +196,109 @@ class ImageTopic(ImageTopicInterface):
         self.topic.publish(Message(message))
 
     def on_image(self, message: dict) -> None:
-        image_data = message["data"].encode("ascii")
-        image_bytes = base64.b64decode(image_data)
+        if not self.should_capture_image:
+            return
+
+        with self._frame_available:
+            self._latest = message
+            self._frame_available.notify()
+
+    def _store_images(self) -> None:
+        while True:
+            with self._frame_available:
+                while self._latest is None:
+                    self._frame_available.wait()
+                message: dict = self._latest
+                self._latest = None
+
+            # A failing frame must not stop the writer. The capture request is
+            # left pending so the next frame is tried instead.
+            try:
+                self._store_image(message=message)
+            except Exception:
+                self.logger.exception(f"Failed to store image from {self.name}")
+
+    def _store_image(self, message: dict) -> None:
+        with self._frame_available:
+            if not self.should_capture_image:
+                return
+            capture_id: int = self._capture_id
+
+        image_bytes: bytes = a2b_base64(message["data"])
 
-        if self.should_capture_image:
-            if self.log_callbacks:
-                self.logger.debug(f"Updated value for topic {self.name}")
+        if self.log_callbacks:
+            self.logger.debug(f"Updated value for topic {self.name}")
 
-            with open(self.current_filename, "wb") as image_file:
-                image_file.write(image_bytes)
+        # The capture may have been cancelled or replaced while decoding. The
+        # file descriptor is handed over under the lock so take_image and
+        # cancel_image never close it while it is being written.
+        with self._frame_available:
+            if not self.should_capture_image or capture_id != self._capture_id:
+                return
+            image_file: Optional[int] = self.current_file
+            self.current_file = None
+            self.current_image = image_bytes
             self.should_capture_image = False
+            self.image_stored = True
+        self.waiters.notify()
+
+        if image_file is not None:
+            self._write_image(image_file=image_file, image_bytes=image_bytes)
+
+    def _write_image(self, image_file: int, image_bytes: bytes) -> None:
+        image_view: memoryview = memoryview(image_bytes)
+        written: int = 0
+        try:
+            while written < len(image_view):
+                written += os.write(image_file, image_view[written:])
+        finally:
+            os.close(image_file)
 
     def stored_image(self) -> bool:
-        return self.current_filename.is_file()
+        return self.image_stored
+
+    async def wait_for_stored_image(self) -> None:
+        await self.waiters.wait_for(self.stored_image)
 
     def take_image(self) -> None:
-        self.should_capture_image = True
+        filename: Optional[Path] = None
+        image_file: Optional[int] = None
+        if self.store_on_disk:
+            filename = Path(f"{self.storage_folder.as_posix()}/{str(uuid4())}.jpeg")
+            filename.parent.mkdir(exist_ok=True)
+            image_file = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+
+        with self._frame_available:
+            self._discard_file()
+            self._capture_id += 1
+            self.current_file = image_file
+            self.current_filename = filename
+            self.current_image = None
+            self.image_stored = False
+
+            self.should_capture_image = True
+
+    def cancel_image(self) -> None:
+        with self._frame_available:
+            self.should_capture_image = False
+            self._discard_file()
+
+    def _discard_file(self) -> None:
+        # Only called with the lock held. A descriptor still set here was never
+        # handed to the writer, so the file is empty and can be removed.
+        if self.current_file is None:
+            return
 
-        filename: Path = Path(f"{self.storage_folder.as_posix()}/{str(uuid4())}.jpeg")
-        filename.parent.mkdir(exist_ok=True)
-        self.current_filename = filename
+        os.close(self.current_file)
+        self.current_file = None
+        self.current_filename.unlink(missing_ok=True)
 
     def register_run_id(self, run_id: str) -> None:
-        if not self.should_capture_image:
-            self.filenames[run_id] = self.current_filename
+        if not self.should_capture_image and self.current_image is not None:
+            self.images[run_id] = self.current_image
 
     def read_image(self, run_id: str) -> bytes:
-        filename: Path = self.filenames[run_id]
-        with open(filename, "rb") as image_file:
-            image_data = image_file.read()
-
-        return image_data
+        return self.images.pop(run_id)
 
     def subscribe(self) -> None:
         self.topic.subscribe(self.on_image)
@@ -0,0 +1,16 @@
+from io import BytesIO
+
+import PIL.Image as PILImage
+
+
+def get_thermal_image(image_data: bytes, file_type: str) -> bytes:
+    with PILImage.open(BytesIO(image_data)) as image:
+        image_red = image.getchannel(0)
+
+    with image_red:
+        if file_type == "raw":
+            return image_red.tobytes()
+
+        with BytesIO() as image_red_io:
+            image_red.save(image_red_io, format=file_type)
+            return image_red_io.getvalue()
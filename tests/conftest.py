@@ -0,0 +1,5 @@
+import os
+
+# The configuration refuses to load without an environment, and it is read
+# when the isar_turtlebot modules are imported during collection.
+os.environ.setdefault("ENVIRONMENT", "test")
@@ -0,0 +1,29 @@
+import pytest
+
+from isar_turtlebot.ros_bridge.ros_bridge import parse_mission_status
+
+
+def _status_message(goal_id: str, status: int = 1) -> dict:
+    return {"status_list": [{"goal_id": {"id": goal_id}, "status": status}]}
+
+
+@pytest.mark.parametrize(
+    "goal_id, expected_run_id",
+    [
+        ("move_base-1-1533.746000000", "11533"),
+        ("/move_base-1-1533.746000000", "/11533"),
+    ],
+)
+def test_parse_mission_status_cleans_run_id(goal_id: str, expected_run_id: str):
+    assert parse_mission_status(_status_message(goal_id, status=3)) == (
+        expected_run_id,
+        3,
+    )
+
+
+def test_parse_mission_status_empty_status_list():
+    assert parse_mission_status({"status_list": []}) is None
+
+
+def test_parse_mission_status_missing_goal_id():
+    assert parse_mission_status({"status_list": [{"status": 1}]}) is None